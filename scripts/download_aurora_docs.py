@@ -11,44 +11,137 @@ static assets.
 from __future__ import annotations
 
 import argparse
+import base64
+import codecs
 import collections
+import functools
+import http.client
+import io
+import json
+import os
 import re
 import sys
+import threading
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from html import unescape
 from html.parser import HTMLParser
 from pathlib import Path
-from typing import Iterable
-from urllib.parse import quote, urljoin, urlsplit, urlunsplit
-from urllib.request import Request, urlopen
+from typing import Any, Callable, Iterable
+from urllib.error import HTTPError
+from urllib.parse import quote, unquote, urljoin, urlsplit, urlunsplit
+from urllib.request import getproxies, proxy_bypass
 
 USER_AGENT = "aur-doc-downloader/1.0 (+https://docs.aurora-wow.wtf/)"
+DEFAULT_WORKERS = 16
+WRITE_WORKERS = 4
+STREAM_CHUNK_SIZE = 64 * 1024
+MAX_REDIRECTS = 10
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+CACHE_FILENAME = ".crawl-cache.json"
+
+
+LINK_ATTRIBUTES = {"a": "href", "link": "href", "script": "src", "img": "src"}
+LINK_ATTRIBUTES_BYTES = {tag.encode(): attribute.encode() for tag, attribute in LINK_ATTRIBUTES.items()}
+
+# A small byte-level tokenizer that follows the grammar of ``html.parser`` closely
+# enough to find the same links: attributes are read at real attribute positions,
+# comments, declarations and end tags are skipped, and the raw text of
+# <script>/<style> elements is not searched for tags. Every pattern only moves
+# forward, so attributes of any length are read and malformed pages stay linear.
+TAG_OPEN_PATTERN = re.compile(
+    rb"<(!--|!\[cdata\[|[!?/])|<([a-zA-Z][^\t\n\r\f />\x00]*)(?:\s|/(?!>))*", flags=re.IGNORECASE
+)
+MARKUP_END_PATTERNS = {
+    b"!--": re.compile(rb"--\s*>"),
+    b"![cdata[": re.compile(rb"\]\s*\]\s*>"),
+}
+MARKUP_END_DEFAULT_PATTERN = re.compile(rb">")
+ATTRIBUTE_PATTERN = re.compile(
+    rb"""((?<=['"\s/])[^\s/>][^\s/=>]*)(\s*=+\s*('[^']*'|"[^"]*"|(?!['"])[^>\s]*))?(?:\s|/(?!>))*"""
+)
+TAG_CLOSE_PATTERN = re.compile(rb"\s*(/?)>")
+INCOMPLETE_TAG_PATTERN = re.compile(rb"\s*(?:[a-zA-Z=/]|\Z)")
+RAW_TEXT_END_PATTERNS = {
+    b"script": re.compile(rb"</\s*script\s*>", flags=re.IGNORECASE),
+    b"style": re.compile(rb"</\s*style\s*>", flags=re.IGNORECASE),
+}
+
+
+def extract_links(data: bytes, encoding: str = "utf-8") -> set[tuple[str, str]]:
+    """Extract href and src attributes from an HTML document in the given ``encoding``.
+
+    >>> sorted(extract_links(b'<a title="x src=foo" href="/real">'))
+    [('/real', 'a')]
+    >>> sorted(extract_links(b'<img href="#" src="/logo.png"><!-- <a href="/hidden"> -->'))
+    [('/logo.png', 'img')]
+    >>> sorted(extract_links(b'<script>document.write("<a href=/js>")</script><a href=/after>'))
+    [('/after', 'a')]
+    >>> sorted(extract_links(b'<img srcset="' + b'/i.png 2x, ' * 200 + b'" src="/i.png">'))
+    [('/i.png', 'img')]
+    >>> sorted(extract_links(b'<a class="' + b'p-4 ' * 400 + b'" href="/x">'))
+    [('/x', 'a')]
+    """
+
+    links: set[tuple[str, str]] = set()
+    position = 0
+    while match := TAG_OPEN_PATTERN.search(data, position):
+        if match.group(1):
+            markup_end = MARKUP_END_PATTERNS.get(match.group(1).lower(), MARKUP_END_DEFAULT_PATTERN)
+            end = markup_end.search(data, match.end())
+            if not end:
+                break
+            position = end.end()
+            continue
 
-
-class LinkExtractor(HTMLParser):
-    """Extract href and src attributes from HTML documents."""
-
-    def __init__(self) -> None:
-        super().__init__()
-        self.links: set[tuple[str, str]] = set()
-
-    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
-        attribute_names = {"a": "href", "link": "href", "script": "src", "img": "src"}
-        attr_name = attribute_names.get(tag)
-        if not attr_name:
-            return
-        for name, value in attrs:
-            if name == attr_name and value:
-                self.links.add((value, tag))
+        tag = match.group(2).lower()
+        link_attribute = LINK_ATTRIBUTES_BYTES.get(tag)
+        values: list[bytes] = []
+        position = match.end()
+        while attribute := ATTRIBUTE_PATTERN.match(data, position):
+            position = attribute.end()
+            value = attribute.group(3)
+            if not attribute.group(2) or attribute.group(1).lower() != link_attribute:
+                continue
+            if value[:1] in {b"'", b'"'} and value[:1] == value[-1:]:
+                value = value[1:-1]
+            if value:
+                values.append(value)
+        close = TAG_CLOSE_PATTERN.match(data, position)
+        if close:
+            position = close.end()
+        elif INCOMPLETE_TAG_PATTERN.match(data, position):
+            # Like html.parser, stop at a tag that runs to the end of the input; any
+            # other stray character simply ends the tag where it stands.
+            break
+
+        for value in values:
+            links.add((unescape(value.decode(encoding, errors="ignore")), tag.decode("ascii")))
+        raw_text_end = RAW_TEXT_END_PATTERNS.get(tag)
+        if raw_text_end and not (close and close.group(1)):
+            end = raw_text_end.search(data, position)
+            if not end:
+                break
+            position = end.end()
+    return links
 
 
 SAFE_PATH_CHARS = "/:@!$&'()*+,;=-._~%"
 
+# Strings made only of these characters come out of ``quote`` unchanged.
+SAFE_PATH_PATTERN = re.compile(f"[A-Za-z0-9{re.escape(SAFE_PATH_CHARS)}]*")
+# ``;`` is excluded for whole URLs because ``urljoin`` drops an empty trailing parameter.
+CANONICAL_URL_PATTERN = re.compile(f"[A-Za-z0-9{re.escape(SAFE_PATH_CHARS.replace(';', ''))}]*")
 
+
+@functools.lru_cache(maxsize=65536)
 def normalize_path(path: str) -> str:
     """Percent-encode a URL path while keeping already-encoded segments intact."""
 
+    if SAFE_PATH_PATTERN.fullmatch(path):
+        return path or "/"
     # ``quote`` leaves existing ``%xx`` sequences untouched when ``%`` is marked as safe.
     return quote(path or "/", safe=SAFE_PATH_CHARS)
 
@@ -56,6 +149,12 @@ def normalize_path(path: str) -> str:
 def resolve_candidate(base_url: str, base_netloc: str, candidate: str) -> str | None:
     """Return a normalized absolute URL within the documentation host."""
 
+    # Absolute on-host links without a query, fragment or unsafe characters are
+    # already in normalized form, so skip the join/split/quote round trip.
+    on_host = (f"https://{base_netloc}/", f"http://{base_netloc}/")
+    if candidate.startswith(on_host) and CANONICAL_URL_PATTERN.fullmatch(candidate):
+        return candidate
+
     absolute = urljoin(base_url, candidate)
     parsed = urlsplit(absolute)
     if parsed.scheme not in {"http", "https"}:
@@ -95,20 +194,334 @@ def url_to_path(
     return output_dir / relative
 
 
-def fetch(url: str, referer: str | None) -> tuple[bytes, str]:
-    request = Request(url, headers={"User-Agent": USER_AGENT})
+class ConnectionPool:
+    """Keep one HTTP/1.1 keep-alive connection per worker thread and host.
+
+    Every response must be read to the end before the next request on the same
+    thread, otherwise the underlying connection cannot be reused. Proxies from the
+    ``http_proxy``/``https_proxy``/``no_proxy`` environment are used like
+    ``urlopen`` would.
+    """
+
+    def __init__(self, headers: dict[str, str] | None = None, timeout: float = 30.0) -> None:
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.local = threading.local()
+        self.proxies = getproxies()
+        self.routes: dict[tuple[str, str], tuple[str, dict[str, str]] | None] = {}
+
+    def _connections(self) -> dict[tuple[str, str], http.client.HTTPConnection]:
+        connections = getattr(self.local, "connections", None)
+        if connections is None:
+            connections = self.local.connections = {}
+        return connections
+
+    def _proxy(self, scheme: str, netloc: str) -> tuple[str, dict[str, str]] | None:
+        """Return the proxy ``host:port`` and its headers for a host, or ``None`` to connect directly."""
+
+        key = (scheme, netloc)
+        if key not in self.routes:
+            proxy = self.proxies.get(scheme)
+            route = None
+            if proxy and not proxy_bypass(netloc):
+                parsed = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+                proxy_headers = {}
+                if parsed.username is not None:
+                    credentials = f"{unquote(parsed.username)}:{unquote(parsed.password or '')}"
+                    proxy_headers["Proxy-Authorization"] = f"Basic {base64.b64encode(credentials.encode()).decode('ascii')}"
+                route = (parsed.netloc.rpartition("@")[2], proxy_headers)
+            self.routes[key] = route
+        return self.routes[key]
+
+    def _send(self, scheme: str, netloc: str, target: str, headers: dict[str, str]) -> http.client.HTTPResponse:
+        proxy = self._proxy(scheme, netloc)
+        if proxy and scheme == "http":
+            # Plain HTTP goes to the proxy with the absolute URL as the request target.
+            target = f"http://{netloc}{target}"
+            headers = {**headers, **proxy[1]}
+        connections = self._connections()
+        connection = connections.get((scheme, netloc))
+        if connection is not None:
+            try:
+                connection.request("GET", target, headers=headers)
+                return connection.getresponse()
+            except (http.client.HTTPException, OSError):
+                # The server may have dropped the idle connection; retry on a fresh one.
+                connection.close()
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        if proxy:
+            connection = connection_class(proxy[0], timeout=self.timeout)
+            if scheme == "https":
+                # HTTPS is tunnelled through the proxy with CONNECT.
+                connection.set_tunnel(netloc, headers=proxy[1])
+        else:
+            connection = connection_class(netloc, timeout=self.timeout)
+        connections[(scheme, netloc)] = connection
+        connection.request("GET", target, headers=headers)
+        return connection.getresponse()
+
+    def request(self, url: str, headers: dict[str, str] | None = None) -> http.client.HTTPResponse:
+        """Send a GET request, following redirects, and return the final response."""
+
+        request_headers = {**self.headers, **(headers or {})}
+        for _ in range(MAX_REDIRECTS + 1):
+            parsed = urlsplit(url)
+            if parsed.scheme not in {"http", "https"}:
+                raise ValueError(f"Unsupported URL scheme: {url}")
+            target = parsed.path or "/"
+            if parsed.query:
+                target += f"?{parsed.query}"
+            response = self._send(parsed.scheme, parsed.netloc, target, request_headers)
+            location = response.headers.get("Location")
+            if response.status in REDIRECT_STATUSES and location:
+                response.read()
+                url = urljoin(url, location)
+                continue
+            if response.status >= 400:
+                response.read()
+                raise HTTPError(url, response.status, response.reason, response.headers, None)
+            return response
+        raise HTTPError(url, response.status, "Too many redirects", response.headers, None)
+
+
+CONNECTION_POOL = ConnectionPool(headers={"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"})
+
+
+class BodyDecoder:
+    """Undo the ``Content-Encoding`` the server applied to a response body, chunk by chunk."""
+
+    def __init__(self, content_encoding: str | None) -> None:
+        encoding = (content_encoding or "").strip().lower()
+        self.wbits: int | None = None
+        # A gzip body may hold several members back to back.
+        self.multiple_members = encoding in {"gzip", "x-gzip"}
+        if self.multiple_members:
+            self.wbits = 16 + zlib.MAX_WBITS
+        elif encoding == "deflate":
+            self.wbits = zlib.MAX_WBITS
+        self.decompressor = zlib.decompressobj(self.wbits) if self.wbits is not None else None
+        # Deflate input is kept until its two-byte zlib header has been checked, so
+        # that it can be replayed if the header turns out to be missing.
+        self.header: bytes | None = b"" if encoding == "deflate" else None
+
+    def decode(self, chunk: bytes) -> bytes:
+        if self.decompressor is None:
+            return chunk
+        if self.header is not None:
+            self.header += chunk
+            try:
+                output = self.decompressor.decompress(chunk)
+            except zlib.error:
+                # Some servers send a raw deflate stream without the zlib wrapper.
+                self.wbits = -zlib.MAX_WBITS
+                self.decompressor = zlib.decompressobj(self.wbits)
+                chunk, self.header = self.header, None
+                return self._decompress(chunk)
+            if len(self.header) >= 2:
+                self.header = None
+            return output
+        return self._decompress(chunk)
+
+    def _decompress(self, chunk: bytes) -> bytes:
+        output = self.decompressor.decompress(chunk)
+        while self.multiple_members and self.decompressor.eof and self.decompressor.unused_data.strip(b"\0"):
+            chunk = self.decompressor.unused_data
+            self.decompressor = zlib.decompressobj(self.wbits)
+            output += self.decompressor.decompress(chunk)
+        return output
+
+    def flush(self) -> bytes:
+        if self.decompressor is None:
+            return b""
+        output = self.decompressor.flush()
+        if not self.decompressor.eof:
+            raise EOFError("Compressed response body ended before the end-of-stream marker")
+        return output
+
+
+def decode_body(data: bytes, content_encoding: str | None) -> bytes:
+    """Undo the ``Content-Encoding`` the server applied to a response body."""
+
+    decoder = BodyDecoder(content_encoding)
+    return decoder.decode(data) + decoder.flush()
+
+
+def stream_body(response: http.client.HTTPResponse, path: Path) -> None:
+    """Copy a response body to ``path`` in fixed-size chunks, undoing its ``Content-Encoding``."""
+
+    decoder = BodyDecoder(response.headers.get("Content-Encoding"))
+    # Write next to the target first so an interrupted download never leaves a truncated file.
+    partial = path.with_name(f"{path.name}.part")
+    try:
+        with partial.open("wb") as handle:
+            while chunk := response.read(STREAM_CHUNK_SIZE):
+                handle.write(decoder.decode(chunk))
+            handle.write(decoder.flush())
+        os.replace(partial, path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+
+@dataclass
+class FetchResult:
+    data: bytes
+    content_type: str
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
+    path: Path | None = None
+
+    @functools.cached_property
+    def text(self) -> str:
+        """The body decoded once, so the Markdown and link parsers can share it."""
+
+        return self.data.decode(content_charset(self.content_type), errors="ignore")
+
+
+def fetch(
+    url: str,
+    referer: str | None,
+    validators: dict[str, str] | None = None,
+    stream_to: Callable[[str, str], Path | None] | None = None,
+) -> FetchResult:
+    """Download ``url``.
+
+    ``stream_to`` is called with the URL and content type once the headers arrive;
+    when it returns a path, the body is written there chunk by chunk instead of
+    being kept in memory, and :attr:`FetchResult.path` is set.
+    """
+
+    headers = dict(validators or {})
     if referer:
-        request.add_header("Referer", referer)
-    with urlopen(request) as response:
-        content_type = response.headers.get("Content-Type", "application/octet-stream")
-        data = response.read()
-        return data, content_type
+        headers["Referer"] = referer
+    response = CONNECTION_POOL.request(url, headers)
+    if response.status == 304:
+        response.read()
+        return FetchResult(b"", "", not_modified=True)
+    content_type = response.headers.get("Content-Type", "application/octet-stream")
+    result = FetchResult(
+        b"",
+        content_type,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+    result.path = stream_to(url, content_type) if stream_to else None
+    if result.path is not None:
+        stream_body(response, result.path)
+    else:
+        result.data = decode_body(response.read(), response.headers.get("Content-Encoding"))
+    return result
+
+
+class CrawlCache:
+    """Remember validators of saved responses to make conditional requests on re-runs.
+
+    Each entry records the ``ETag``/``Last-Modified`` headers and content type of a
+    URL together with the file (relative to the output directory) that holds its
+    unmodified body, so a ``304 Not Modified`` reply can be served from disk.
+    Pages converted to Markdown store their links instead, because the original
+    HTML is not kept; an unchanged page then needs neither conversion nor a write.
+    """
+
+    def __init__(self, output_dir: Path, output_format: str) -> None:
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.path = output_dir / CACHE_FILENAME
+        self.entries: dict[str, dict[str, Any]] = {}
+        try:
+            entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            entries = {}
+        if isinstance(entries, dict):
+            self.entries = entries
+
+    def validators(self, url: str) -> dict[str, str]:
+        entry = self.entries.get(url)
+        if not entry or not (self.output_dir / entry["path"]).is_file():
+            return {}
+        if "links" in entry and self.output_format != "markdown":
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def restore(self, url: str, result: FetchResult) -> set[tuple[str, str]] | None:
+        """Fill a ``304 Not Modified`` result from the cache.
+
+        Returns the recorded links when the page was saved as Markdown, since its
+        HTML body is not on disk. Other bodies are only read back when they are
+        scanned for links; images, fonts and the like stay on disk.
+        """
+
+        entry = self.entries[url]
+        result.content_type = entry["content_type"]
+        result.etag = entry.get("etag")
+        result.last_modified = entry.get("last_modified")
+        if "links" in entry:
+            return {(link, tag) for link, tag in entry["links"]}
+        if should_parse_html(result.content_type) or should_parse_js(result.content_type):
+            result.data = (self.output_dir / entry["path"]).read_bytes()
+        return None
+
+    def update(
+        self,
+        url: str,
+        path: Path,
+        result: FetchResult,
+        links: set[tuple[str, str]] | None = None,
+    ) -> None:
+        if not result.etag and not result.last_modified:
+            self.entries.pop(url, None)
+            return
+        entry: dict[str, Any] = {
+            "path": path.relative_to(self.output_dir).as_posix(),
+            "content_type": result.content_type,
+        }
+        if result.etag:
+            entry["etag"] = result.etag
+        if result.last_modified:
+            entry["last_modified"] = result.last_modified
+        if links is not None:
+            entry["links"] = sorted(links)
+        self.entries[url] = entry
+
+    def save(self) -> None:
+        temporary = self.path.with_name(f"{self.path.name}.tmp")
+        temporary.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(temporary, self.path)
 
 
 def normalize_content_type(content_type: str) -> str:
     return content_type.split(";", 1)[0].strip().lower()
 
 
+def content_charset(content_type: str) -> str:
+    """Return the codec named by the ``charset`` parameter, or UTF-8.
+
+    >>> content_charset("text/html; charset=ISO-8859-1"), content_charset("text/html; charset=base64")
+    ('iso8859-1', 'utf-8')
+    >>> FetchResult(b"<p>ok</p>", "text/html; charset=rot13").text
+    '<p>ok</p>'
+    """
+
+    for parameter in content_type.split(";")[1:]:
+        name, _, value = parameter.partition("=")
+        if name.strip().lower() == "charset":
+            try:
+                charset = codecs.lookup(value.strip().strip("\"'")).name
+                # Reject codecs that cannot decode arbitrary bytes to str, such as base64,
+                # rot13 or punycode, so that decoding a page never raises.
+                b"\xff".decode(charset, errors="ignore")
+            except (LookupError, UnicodeError):
+                break
+            return charset
+    return "utf-8"
+
+
 def should_parse_html(content_type: str) -> bool:
     return normalize_content_type(content_type) == "text/html"
 
@@ -164,107 +577,66 @@ class CrawlItem:
     referer: str | None
 
 
+@dataclass
+class ListState:
+    ordered: bool
+    indent: str
+    index: int = 0
+
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
 class MarkdownConverter(HTMLParser):
-    """Convert HTML fragments into a lightly formatted Markdown string."""
+    """Convert HTML fragments into a lightly formatted Markdown string.
+
+    The converter also records the same href and src links as
+    :func:`extract_links`, so a page only needs to be parsed once.
+    """
 
     def __init__(self) -> None:
         super().__init__()
-        self.parts: list[str] = []
+        self.buffer = io.StringIO()
         self.trailing_newlines = 0
-        self.list_stack: list[dict[str, int | str]] = []
+        self.list_stack: list[ListState] = []
         self.anchor_stack: list[dict[str, str | bool | int]] = []
         self.skip_depth = 0
         self.in_code_block = False
         self.inline_code = 0
-
-    def _refresh_trailing_newlines(self) -> None:
-        if not self.parts:
-            self.trailing_newlines = 0
-            return
-        last = self.parts[-1]
-        if last.endswith("\n"):
-            self.trailing_newlines = len(last) - len(last.rstrip("\n"))
-        else:
-            self.trailing_newlines = 0
+        self.links: set[tuple[str, str]] = set()
 
     def write(self, text: str) -> None:
         if not text:
             return
-        self.parts.append(text)
+        self.buffer.write(text)
         if text.endswith("\n"):
             self.trailing_newlines = len(text) - len(text.rstrip("\n"))
         else:
             self.trailing_newlines = 0
 
     def ensure_newlines(self, count: int) -> None:
-        if not self.parts or count == 0:
+        if not self.buffer.tell() or count == 0:
             return
         if self.trailing_newlines >= count:
             return
         needed = count - self.trailing_newlines
-        self.parts.append("\n" * needed)
+        self.buffer.write("\n" * needed)
         self.trailing_newlines = count
 
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
-        attrs_dict = {k: v for k, v in attrs}
+        link_attribute = LINK_ATTRIBUTES.get(tag)
+        if link_attribute:
+            for name, value in attrs:
+                if name == link_attribute and value:
+                    self.links.add((value, tag))
         if tag in {"script", "style"}:
             self.skip_depth += 1
             return
         if self.skip_depth:
             return
-        if tag in {"p", "section", "article", "div"}:
-            self.ensure_newlines(2)
-        elif tag.startswith("h") and len(tag) == 2 and tag[1].isdigit():
-            level = int(tag[1])
-            level = max(1, min(level, 6))
-            self.ensure_newlines(2)
-            self.write("#" * level + " ")
-        elif tag == "br":
-            self.write("  \n")
-        elif tag in {"strong", "b"}:
-            self.write("**")
-        elif tag in {"em", "i"}:
-            self.write("*")
-        elif tag == "code":
-            if self.in_code_block:
-                return
-            self.inline_code += 1
-            self.write("`")
-        elif tag == "pre":
-            self.ensure_newlines(2)
-            self.write("```\n")
-            self.in_code_block = True
-        elif tag == "ul":
-            self.ensure_newlines(2)
-            self.list_stack.append({"type": "ul", "index": 0})
-        elif tag == "ol":
-            self.ensure_newlines(2)
-            self.list_stack.append({"type": "ol", "index": 0})
-        elif tag == "li":
-            if self.list_stack:
-                self.ensure_newlines(1)
-                indent = "  " * (len(self.list_stack) - 1)
-                current = self.list_stack[-1]
-                if current["type"] == "ol":
-                    current["index"] = int(current.get("index", 0)) + 1
-                    prefix = f"{current['index']}. "
-                else:
-                    prefix = "- "
-                self.write(indent + prefix)
-        elif tag == "a":
-            href = attrs_dict.get("href", "") or ""
-            start_index = len(self.parts)
-            self.anchor_stack.append({"href": href, "has_text": False, "index": start_index})
-            self.write("[")
-        elif tag == "img":
-            alt = attrs_dict.get("alt", "") or ""
-            src = attrs_dict.get("src", "") or ""
-            self.write(f"![{alt}]({src})")
-            if self.anchor_stack:
-                self.anchor_stack[-1]["has_text"] = True
-        elif tag == "blockquote":
-            self.ensure_newlines(2)
-            self.write("> ")
+        handler = self.START_HANDLERS.get(tag)
+        if handler:
+            handler(self, tag, attrs)
 
     def handle_endtag(self, tag: str) -> None:
         if tag in {"script", "style"}:
@@ -273,91 +645,202 @@ class MarkdownConverter(HTMLParser):
             return
         if self.skip_depth:
             return
-        if tag in {"p", "section", "article", "div"}:
-            self.ensure_newlines(2)
-        elif tag.startswith("h") and len(tag) == 2 and tag[1].isdigit():
-            self.ensure_newlines(2)
-        elif tag in {"strong", "b"}:
-            self.write("**")
-        elif tag in {"em", "i"}:
-            self.write("*")
-        elif tag == "code":
-            if self.in_code_block:
-                return
-            if self.inline_code:
-                self.write("`")
-                self.inline_code = max(self.inline_code - 1, 0)
-        elif tag == "pre":
-            if self.in_code_block:
-                self.ensure_newlines(1)
-                self.write("```\n")
-                self.ensure_newlines(2)
-                self.in_code_block = False
-        elif tag in {"ul", "ol"}:
-            if self.list_stack:
-                self.list_stack.pop()
-            self.ensure_newlines(2)
-        elif tag == "li":
+        handler = self.END_HANDLERS.get(tag)
+        if handler:
+            handler(self, tag)
+
+    def _start_block(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.ensure_newlines(2)
+
+    def _start_heading(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        level = int(tag[1])
+        level = max(1, min(level, 6))
+        self.ensure_newlines(2)
+        self.write("#" * level + " ")
+
+    def _start_break(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.write("  \n")
+
+    def _start_strong(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.write("**")
+
+    def _start_emphasis(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.write("*")
+
+    def _start_code(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self.in_code_block:
+            return
+        self.inline_code += 1
+        self.write("`")
+
+    def _start_pre(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.ensure_newlines(2)
+        self.write("```\n")
+        self.in_code_block = True
+
+    def _start_list(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.ensure_newlines(2)
+        self.list_stack.append(ListState(ordered=tag == "ol", indent="  " * len(self.list_stack)))
+
+    def _start_list_item(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if not self.list_stack:
+            return
+        self.ensure_newlines(1)
+        current = self.list_stack[-1]
+        if current.ordered:
+            current.index += 1
+            self.write(f"{current.indent}{current.index}. ")
+        else:
+            self.write(f"{current.indent}- ")
+
+    def _start_anchor(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        href = dict(attrs).get("href", "") or ""
+        self.anchor_stack.append(
+            {
+                "href": href,
+                "has_text": False,
+                "index": self.buffer.tell(),
+                "trailing_newlines": self.trailing_newlines,
+            }
+        )
+        self.write("[")
+
+    def _start_image(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attrs_dict = dict(attrs)
+        alt = attrs_dict.get("alt", "") or ""
+        src = attrs_dict.get("src", "") or ""
+        self.write(f"![{alt}]({src})")
+        if self.anchor_stack:
+            self.anchor_stack[-1]["has_text"] = True
+
+    def _start_blockquote(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.ensure_newlines(2)
+        self.write("> ")
+
+    def _end_block(self, tag: str) -> None:
+        self.ensure_newlines(2)
+
+    def _end_strong(self, tag: str) -> None:
+        self.write("**")
+
+    def _end_emphasis(self, tag: str) -> None:
+        self.write("*")
+
+    def _end_code(self, tag: str) -> None:
+        if self.in_code_block:
+            return
+        if self.inline_code:
+            self.write("`")
+            self.inline_code = max(self.inline_code - 1, 0)
+
+    def _end_pre(self, tag: str) -> None:
+        if self.in_code_block:
             self.ensure_newlines(1)
-        elif tag == "a":
-            if not self.anchor_stack:
-                return
-            anchor = self.anchor_stack.pop()
-            href = anchor.get("href", "")
-            if anchor.get("has_text"):
-                self.write(f"]({href})")
-            else:
-                start_index = int(anchor.get("index", len(self.parts)))
-                if start_index < len(self.parts):
-                    self.parts = self.parts[:start_index]
-                    self._refresh_trailing_newlines()
-                self.write(f"<{href}>")
-        elif tag == "blockquote":
+            self.write("```\n")
             self.ensure_newlines(2)
+            self.in_code_block = False
+
+    def _end_list(self, tag: str) -> None:
+        if self.list_stack:
+            self.list_stack.pop()
+        self.ensure_newlines(2)
+
+    def _end_list_item(self, tag: str) -> None:
+        self.ensure_newlines(1)
+
+    def _end_anchor(self, tag: str) -> None:
+        if not self.anchor_stack:
+            return
+        anchor = self.anchor_stack.pop()
+        href = anchor.get("href", "")
+        if anchor.get("has_text"):
+            self.write(f"]({href})")
+        else:
+            start_index = int(anchor.get("index", self.buffer.tell()))
+            if start_index < self.buffer.tell():
+                # Drop the "[" (and any markup) written for the anchor without text.
+                self.buffer.seek(start_index)
+                self.buffer.truncate()
+                self.trailing_newlines = int(anchor.get("trailing_newlines", 0))
+            self.write(f"<{href}>")
+
+    # One dictionary lookup per tag replaces a chain of comparisons; tags without
+    # an entry (``span``, ``nav``, ...) are ignored straight away.
+    HEADINGS = [f"h{digit}" for digit in range(10)]
+    START_HANDLERS: dict[str, Callable[[MarkdownConverter, str, list[tuple[str, str | None]]], None]] = {
+        **dict.fromkeys(["p", "section", "article", "div"], _start_block),
+        **dict.fromkeys(HEADINGS, _start_heading),
+        "br": _start_break,
+        "strong": _start_strong,
+        "b": _start_strong,
+        "em": _start_emphasis,
+        "i": _start_emphasis,
+        "code": _start_code,
+        "pre": _start_pre,
+        "ul": _start_list,
+        "ol": _start_list,
+        "li": _start_list_item,
+        "a": _start_anchor,
+        "img": _start_image,
+        "blockquote": _start_blockquote,
+    }
+    END_HANDLERS: dict[str, Callable[[MarkdownConverter, str], None]] = {
+        **dict.fromkeys(["p", "section", "article", "div", "blockquote", *HEADINGS], _end_block),
+        "strong": _end_strong,
+        "b": _end_strong,
+        "em": _end_emphasis,
+        "i": _end_emphasis,
+        "code": _end_code,
+        "pre": _end_pre,
+        "ul": _end_list,
+        "ol": _end_list,
+        "li": _end_list_item,
+        "a": _end_anchor,
+    }
 
     def handle_data(self, data: str) -> None:
         if self.skip_depth:
             return
         if not data:
             return
+        # HTMLParser already decodes character references (``convert_charrefs``),
+        # so the text is not unescaped a second time here.
         if self.in_code_block or self.inline_code:
             text = data
         else:
-            text = re.sub(r"\s+", " ", data)
-        text = unescape(text)
+            text = WHITESPACE_PATTERN.sub(" ", data)
         if not self.in_code_block and not self.inline_code:
             text = text.replace("\xa0", " ")
         if self.anchor_stack and text.strip():
             self.anchor_stack[-1]["has_text"] = True
         self.write(text)
 
-    def handle_entityref(self, name: str) -> None:
-        self.handle_data(unescape(f"&{name};"))
+    def get_markdown(self) -> str:
+        return self.buffer.getvalue().strip("\n") + "\n"
 
-    def handle_charref(self, name: str) -> None:
-        if name.startswith("x"):
-            value = chr(int(name[1:], 16))
-        else:
-            value = chr(int(name))
-        self.handle_data(value)
 
-    def get_markdown(self) -> str:
-        content = "".join(self.parts)
-        return content.strip("\n") + "\n"
+TITLE_PATTERN = re.compile(r"<title>(.*?)</title>", flags=re.IGNORECASE | re.DOTALL)
+TITLE_SUFFIX_PATTERN = re.compile(r"\s+\|.*")
 
 
 def extract_title(html: str) -> str | None:
-    match = re.search(r"<title>(.*?)</title>", html, flags=re.IGNORECASE | re.DOTALL)
+    match = TITLE_PATTERN.search(html)
     if not match:
         return None
     title = unescape(match.group(1)).strip()
-    return re.sub(r"\s+\|.*", "", title).strip() or None
+    return TITLE_SUFFIX_PATTERN.sub("", title).strip() or None
 
 
 def html_to_markdown(source_url: str, html: str) -> str:
     converter = MarkdownConverter()
     converter.feed(html)
     converter.close()
+    return render_markdown(converter, source_url, html)
+
+
+def render_markdown(converter: MarkdownConverter, source_url: str, html: str) -> str:
+    """Build the Markdown document for a page that ``converter`` has already parsed."""
+
     body = converter.get_markdown()
     title = extract_title(html)
     timestamp = datetime.now(timezone.utc).isoformat()
@@ -370,6 +853,13 @@ def html_to_markdown(source_url: str, html: str) -> str:
     return "\n".join(front_matter) + body
 
 
+def write_output(path: Path, content: bytes | str) -> None:
+    if isinstance(content, str):
+        path.write_text(content, encoding="utf-8")
+    else:
+        path.write_bytes(content)
+
+
 def load_seed_paths(path: Path | None) -> list[str]:
     if path is None:
         return []
@@ -388,74 +878,132 @@ def crawl(
     output_format: str,
     seeds: Iterable[str] | None = None,
     follow_links: bool = True,
+    workers: int = DEFAULT_WORKERS,
 ) -> None:
     parsed_base = urlsplit(base_url)
     if parsed_base.scheme not in {"http", "https"}:
         raise ValueError("Only HTTP and HTTPS URLs are supported")
+    if workers < 1:
+        raise ValueError("At least one worker is required")
 
     base_netloc = parsed_base.netloc
     normalized_start = urlunsplit((parsed_base.scheme, parsed_base.netloc, parsed_base.path or "/", "", ""))
 
+    # URLs are marked as seen when they are queued, so the queue never holds duplicates.
     queue: collections.deque[CrawlItem] = collections.deque()
+    seen: set[str] = set()
     initial_seeds = list(seeds or [])
     if initial_seeds:
         for entry in initial_seeds:
             candidate = resolve_candidate(normalized_start, base_netloc, entry)
-            if candidate:
+            if candidate and candidate not in seen:
+                seen.add(candidate)
                 queue.append(CrawlItem(candidate, None))
     else:
+        seen.add(normalized_start)
         queue.append(CrawlItem(normalized_start, None))
-    seen: set[str] = set()
-
-    while queue:
-        item = queue.popleft()
-        if item.url in seen:
-            continue
-        seen.add(item.url)
-
-        try:
-            data, content_type = fetch(item.url, item.referer)
-        except Exception as exc:  # pragma: no cover - depends on external network
-            print(f"Failed to fetch {item.url}: {exc}", file=sys.stderr)
-            continue
-
-        target_path = url_to_path(output_dir, item.url, base_netloc, output_format, content_type)
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        if output_format == "markdown" and should_parse_html(content_type):
-            html = data.decode("utf-8", errors="ignore")
-            markdown = html_to_markdown(item.url, html)
-            target_path.write_text(markdown, encoding="utf-8")
-        else:
-            target_path.write_bytes(data)
-        print(f"Saved {item.url} -> {target_path.relative_to(output_dir)}")
 
-        if should_parse_html(content_type):
-            parser = LinkExtractor()
-            try:
-                parser.feed(data.decode("utf-8", errors="ignore"))
-            except Exception as exc:  # pragma: no cover - parser errors depend on content
-                print(f"Failed to parse HTML from {item.url}: {exc}", file=sys.stderr)
+    # Fetches and file writes run on worker threads; parsing and queue bookkeeping
+    # stay on this thread so ``seen`` and ``queue`` never need locking.
+    cache = CrawlCache(output_dir, output_format)
+    pending: dict[Future[FetchResult], CrawlItem] = {}
+    writes: dict[Path, Future[None]] = {}
+    created_dirs: set[Path] = set()
+
+    def make_parent(path: Path) -> None:
+        if path.parent not in created_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(path.parent)
+
+    def stream_target(url: str, content_type: str) -> Path | None:
+        # Only HTML and JavaScript bodies are parsed; everything else goes straight to disk.
+        if should_parse_html(content_type) or should_parse_js(content_type):
+            return None
+        path = url_to_path(output_dir, url, base_netloc, output_format, content_type)
+        make_parent(path)
+        return path
+
+    with ThreadPoolExecutor(max_workers=workers) as executor, ThreadPoolExecutor(WRITE_WORKERS) as write_pool:
+        while queue or pending:
+            while queue and len(pending) < workers:
+                item = queue.popleft()
+                validators = cache.validators(item.url)
+                pending[executor.submit(fetch, item.url, item.referer, validators, stream_target)] = item
+            if not pending:
                 continue
 
-            for link, tag in parser.links:
-                candidate = resolve_candidate(item.url, base_netloc, link)
-                if not candidate or candidate in seen:
-                    continue
-                if output_format == "markdown" and tag in {"link", "script"}:
-                    continue
-                if not follow_links and tag == "a":
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                cached_links: set[tuple[str, str]] | None = None
+                try:
+                    result = future.result()
+                    if result.not_modified:
+                        cached_links = cache.restore(item.url, result)
+                except Exception as exc:  # pragma: no cover - depends on external network
+                    print(f"Failed to fetch {item.url}: {exc}", file=sys.stderr)
                     continue
-                queue.append(CrawlItem(candidate, item.url))
-        if should_parse_js(content_type):
-            try:
-                js_text = data.decode("utf-8", errors="ignore")
-            except Exception:
-                js_text = ""
-            for dependency in extract_js_dependencies(js_text):
-                candidate = resolve_candidate(item.url, base_netloc, dependency)
-                if not candidate or candidate in seen:
-                    continue
-                queue.append(CrawlItem(candidate, item.url))
+                data, content_type = result.data, result.content_type
+
+                target_path = url_to_path(output_dir, item.url, base_netloc, output_format, content_type)
+                make_parent(target_path)
+                converter: MarkdownConverter | None = None
+                content: bytes | str | None = None
+                if cached_links is not None:
+                    # The Markdown written on an earlier run is still current.
+                    status = "Not modified"
+                elif output_format == "markdown" and should_parse_html(content_type):
+                    converter = MarkdownConverter()
+                    converter.feed(result.text)
+                    converter.close()
+                    content = render_markdown(converter, item.url, result.text)
+                    cache.update(item.url, target_path, result, links=converter.links)
+                    status = "Saved"
+                elif result.not_modified:
+                    status = "Not modified"
+                else:
+                    if result.path is None:
+                        content = data
+                    cache.update(item.url, target_path, result)
+                    status = "Saved"
+                if content is not None:
+                    previous = writes.get(target_path)
+                    if previous is not None:
+                        # Several URLs can map to the same file; keep their writes in order.
+                        previous.result()
+                    writes[target_path] = write_pool.submit(write_output, target_path, content)
+                print(f"{status} {item.url} -> {target_path.relative_to(output_dir)}")
+
+                if should_parse_html(content_type):
+                    if cached_links is not None:
+                        links = cached_links
+                    elif converter:
+                        links = converter.links
+                    else:
+                        links = extract_links(data, content_charset(content_type))
+                    for link, tag in links:
+                        if output_format == "markdown" and tag in {"link", "script"}:
+                            continue
+                        if not follow_links and tag == "a":
+                            continue
+                        candidate = resolve_candidate(item.url, base_netloc, link)
+                        if not candidate or candidate in seen:
+                            continue
+                        seen.add(candidate)
+                        queue.append(CrawlItem(candidate, item.url))
+                if should_parse_js(content_type):
+                    for dependency in extract_js_dependencies(result.text):
+                        candidate = resolve_candidate(item.url, base_netloc, dependency)
+                        if not candidate or candidate in seen:
+                            continue
+                        seen.add(candidate)
+                        queue.append(CrawlItem(candidate, item.url))
+
+        for write in writes.values():
+            write.result()
+
+    cache.save()
+    normalize_path.cache_clear()
 
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
@@ -465,6 +1013,7 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--format", choices=["html", "markdown"], default="html", help="Format used to save HTML documents")
     parser.add_argument("--paths-file", help="File that lists documentation paths to download (one per line)")
     parser.add_argument("--no-follow", action="store_true", help="Do not crawl hyperlinks beyond the provided seed paths")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Number of pages to download concurrently")
     return parser.parse_args(argv)
 
 
@@ -484,6 +1033,7 @@ def main(argv: list[str] | None = None) -> int:
             args.format,
             seeds=seeds,
             follow_links=not args.no_follow,
+            workers=args.workers,
         )
     except Exception as exc:
         print(f"Error: {exc}", file=sys.stderr)